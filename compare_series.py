@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Compare evaluation series side by side (e.g. series 1 English prompts vs
+series 2 Hebrew prompts).
+
+Joins results for the same (model, word) across series, reports per-model
+pass-rate deltas, and renders a diff heatmap plus side-by-side tile for every
+matched image pair. Pairs are processed in parallel and cached by the hash of
+both images, the series labels and the rendering parameters, so adding a
+series only computes the pairs that are new.
+"""
+
+import argparse
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# (name, outputs directory, results file) - one entry per series
+SERIES = [
+    ("series1", Path("outputs"), Path("evaluation-results.json")),
+    ("series2", Path("outputs-series2"), Path("evaluation-results-series2.json")),
+]
+
+OUTPUT_BASE = Path("comparisons")
+CACHE_DIR = OUTPUT_BASE / "cache"
+
+# Height of the model-name bar added by annotate_image() in the run scripts
+BAR_HEIGHT = 60
+DIFF_SIZE = (640, 360)
+TILE_HEIGHT = 360
+LABEL_HEIGHT = 40
+SSIM_RADIUS = 3
+
+# Everything that shapes a cached tile or its metrics; part of every cache key
+CACHE_PARAMS = f"v1|{BAR_HEIGHT}|{DIFF_SIZE}|{TILE_HEIGHT}|{LABEL_HEIGHT}|{SSIM_RADIUS}"
+
+
+def safe_name(model_name: str) -> str:
+    """Output file stem used by the run scripts for a model."""
+    return model_name.lower().replace(" ", "-").replace(".", "-")
+
+
+def load_scores(results_path: Path) -> dict:
+    """Load {(model, word): score} from an evaluation-results JSON file."""
+    data = json.loads(results_path.read_text(encoding="utf-8"))
+    scores = {}
+    for entry in data["scores"]:
+        for key, value in entry.items():
+            if key not in ("model", "model_id", "total", "notes") and isinstance(value, int):
+                scores[(entry["model"], key)] = value
+    return scores
+
+
+@lru_cache(maxsize=None)
+def file_hash(path: Path) -> str:
+    """SHA-256 of a file's contents, memoised per path for this run."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def load_array(path: Path) -> np.ndarray:
+    """Load an annotated output as a float32 RGB array without its label bar."""
+    img = Image.open(path).convert("RGB")
+    if img.height > BAR_HEIGHT * 2:
+        img = img.crop((0, 0, img.width, img.height - BAR_HEIGHT))
+    img = img.resize(DIFF_SIZE, Image.LANCZOS)
+    return np.asarray(img, dtype=np.float32) / 255.0
+
+
+def box_filter(a: np.ndarray, radius: int) -> np.ndarray:
+    """Mean over a (2r+1)^2 window using summed-area tables, edge-padded."""
+    k = 2 * radius + 1
+    padded = np.pad(a, radius + 1, mode="edge")
+    sat = padded.cumsum(axis=0).cumsum(axis=1)
+    total = sat[k:, k:] - sat[:-k, k:] - sat[k:, :-k] + sat[:-k, :-k]
+    return total[: a.shape[0], : a.shape[1]] / (k * k)
+
+
+def ssim_map(x: np.ndarray, y: np.ndarray, radius: int = 3) -> np.ndarray:
+    """Per-pixel structural similarity of two grayscale images in [0, 1]."""
+    c1, c2 = 0.01 ** 2, 0.03 ** 2
+    mu_x, mu_y = box_filter(x, radius), box_filter(y, radius)
+    var_x = box_filter(x * x, radius) - mu_x ** 2
+    var_y = box_filter(y * y, radius) - mu_y ** 2
+    cov = box_filter(x * y, radius) - mu_x * mu_y
+    return ((2 * mu_x * mu_y + c1) * (2 * cov + c2)) / (
+        (mu_x ** 2 + mu_y ** 2 + c1) * (var_x + var_y + c2)
+    )
+
+
+def heatmap(diff: np.ndarray) -> np.ndarray:
+    """Map a [0, 1] difference array to black -> red -> yellow -> white RGB."""
+    d = np.clip(diff, 0.0, 1.0)
+    rgb = np.stack([d * 3, d * 3 - 1, d * 3 - 2], axis=-1)
+    return (np.clip(rgb, 0.0, 1.0) * 255).astype(np.uint8)
+
+
+def load_font(size: int):
+    try:
+        return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def make_tile(panels, labels) -> Image.Image:
+    """Lay out equally sized panels left to right with a label under each."""
+    width = sum(p.width for p in panels)
+    tile = Image.new("RGB", (width, TILE_HEIGHT + LABEL_HEIGHT), "white")
+    draw = ImageDraw.Draw(tile)
+    font = load_font(22)
+
+    x = 0
+    for panel, label in zip(panels, labels):
+        tile.paste(panel, (x, 0))
+        bbox = draw.textbbox((0, 0), label, font=font)
+        text_x = x + (panel.width - (bbox[2] - bbox[0])) // 2
+        text_y = TILE_HEIGHT + (LABEL_HEIGHT - (bbox[3] - bbox[1])) // 2
+        draw.text((text_x, text_y), label, fill="black", font=font)
+        x += panel.width
+    return tile
+
+
+def compare_pair(job) -> dict:
+    """Compute diff metrics, heatmap and tile for one image pair (cached)."""
+    pair_hash, path_a, path_b, label_a, label_b = job
+    metrics_path = CACHE_DIR / f"{pair_hash}.json"
+    tile_path = CACHE_DIR / f"{pair_hash}.png"
+    if metrics_path.exists() and tile_path.exists():
+        return json.loads(metrics_path.read_text())
+
+    a, b = load_array(path_a), load_array(path_b)
+    pixel = np.abs(a - b).mean(axis=-1)
+    ssim = ssim_map(a.mean(axis=-1), b.mean(axis=-1), SSIM_RADIUS)
+    perceptual = (1.0 - ssim) / 2.0
+
+    panels = [Image.fromarray((arr * 255).astype(np.uint8)) for arr in (a, b)]
+    panels += [Image.fromarray(heatmap(pixel)), Image.fromarray(heatmap(perceptual))]
+    panels = [p.resize((TILE_HEIGHT * DIFF_SIZE[0] // DIFF_SIZE[1], TILE_HEIGHT)) for p in panels]
+    make_tile(panels, [label_a, label_b, "Pixel diff", "Perceptual diff"]).save(tile_path)
+
+    metrics = {
+        "pixel_diff": round(float(pixel.mean()), 4),
+        "ssim": round(float(ssim.mean()), 4),
+    }
+    metrics_path.write_text(json.dumps(metrics))
+    return metrics
+
+
+def collect_pairs(baseline, others):
+    """Match (model, word) images between the baseline and each other series."""
+    base_name, base_dir, _ = baseline
+    jobs = []
+    for name, outputs_dir, _ in others:
+        for path_b in sorted(outputs_dir.glob("*/*.png")):
+            path_a = base_dir / path_b.parent.name / path_b.name
+            if not path_a.exists():
+                continue
+            key = f"{CACHE_PARAMS}|{base_name}|{name}|{file_hash(path_a)}|{file_hash(path_b)}"
+            pair_hash = hashlib.sha256(key.encode()).hexdigest()
+            jobs.append((name, path_b.parent.name, path_b.stem,
+                         (pair_hash, path_a, path_b, base_name, name)))
+    return jobs
+
+
+def pass_rate_deltas(baseline_scores: dict, other_scores: dict) -> dict:
+    """Per-model pass rates over the words scored in both series."""
+    deltas = {}
+    models = {m for m, _ in baseline_scores} & {m for m, _ in other_scores}
+    for model in sorted(models):
+        words = sorted(w for m, w in other_scores if m == model and (m, w) in baseline_scores)
+        if not words:
+            continue
+        base_rate = sum(baseline_scores[(model, w)] for w in words) / len(words)
+        other_rate = sum(other_scores[(model, w)] for w in words) / len(words)
+        deltas[model] = {
+            "words": words,
+            "baseline": base_rate,
+            "series": other_rate,
+            "delta": other_rate - base_rate,
+        }
+    return deltas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare evaluation series side by side")
+    parser.add_argument("--baseline", default=SERIES[0][0], choices=[name for name, _, _ in SERIES],
+                        help="Series to compare every other series against")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel workers (default: CPU count)")
+    args = parser.parse_args()
+
+    series = {name: (name, outputs_dir, results) for name, outputs_dir, results in SERIES}
+    baseline = series[args.baseline]
+    others = [s for name, s in series.items() if name != args.baseline]
+
+    print("Series Comparison")
+    print("=" * 60)
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    jobs = collect_pairs(baseline, others)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        metrics = list(pool.map(compare_pair, [job for *_, job in jobs], chunksize=4))
+
+    report = {"baseline": args.baseline, "series": {}}
+    baseline_scores = load_scores(baseline[2])
+
+    for name, _, results_path in others:
+        other_scores = load_scores(results_path)
+        deltas = pass_rate_deltas(baseline_scores, other_scores)
+        models = {safe_name(m): m for m, _ in [*baseline_scores, *other_scores]}
+        pairs = []
+        for (series_name, word, stem, job), m in zip(jobs, metrics):
+            if series_name != name:
+                continue
+            tile_dir = OUTPUT_BASE / f"{args.baseline}-vs-{name}" / word
+            tile_dir.mkdir(parents=True, exist_ok=True)
+            tile_path = tile_dir / f"{stem}.png"
+            tile_path.write_bytes((CACHE_DIR / f"{job[0]}.png").read_bytes())
+            model = models.get(stem, stem)
+            pairs.append({
+                "word": word,
+                "model": model,
+                "baseline_score": baseline_scores.get((model, word)),
+                "series_score": other_scores.get((model, word)),
+                "tile": str(tile_path),
+                **m,
+            })
+        report["series"][name] = {"pass_rate": deltas, "pairs": pairs}
+
+        print(f"\n{args.baseline} vs {name}:")
+        print("-" * 60)
+        for model, d in deltas.items():
+            print(f"  {model:<20} {d['baseline']:.0%} -> {d['series']:.0%}  ({d['delta']:+.0%})")
+        marks = {1: "✓", 0: "✗", None: "?"}
+        for p in pairs:
+            print(f"  {p['word']:<8} {p['model']:<20} {marks[p['baseline_score']]} -> {marks[p['series_score']]}  "
+                  f"pixel diff {p['pixel_diff']:.3f}  ssim {p['ssim']:.3f}")
+
+    report_path = OUTPUT_BASE / "comparison-results.json"
+    report_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nSaved: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
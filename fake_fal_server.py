@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the fal.ai queue API, for offline and load-test runs.
+
+Emulates the submit / status / result queue endpoints plus image hosting,
+with configurable latency, error rate and rate limiting. Images are
+synthetic banners rendered deterministically from (seed, model, prompt).
+
+Start the server, then point the eval scripts at it:
+
+    python fake_fal_server.py --port 8765 --latency lognormal:1.5:0.5 --error-rate 0.1
+    FAL_QUEUE_URL=http://127.0.0.1:8765 python run_eval.py
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import urlparse
+
+from PIL import Image, ImageDraw, ImageFont
+
+HEBREW_LETTERS = "אבגדהוזחטיכלמנסעפצקרשת"
+
+FONT_PATHS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansHebrew-Bold.ttf",
+    "/usr/share/fonts/truetype/freefont/FreeSansBold.ttf",
+]
+
+ASPECT_SIZES = {
+    "16:9": (1920, 1080),
+    "9:16": (1080, 1920),
+    "4:3": (1440, 1080),
+    "1:1": (1024, 1024),
+}
+
+
+def reverse_hebrew(text):
+    """Reverse Hebrew text for proper visual display in LTR rendering context."""
+    return text[::-1]
+
+
+def parse_latency(spec: str):
+    """
+    Parse a latency spec into a sampler taking a random.Random.
+
+    Formats (seconds): "fixed:S", "uniform:LO:HI", "normal:MU:SIGMA",
+    "lognormal:MEDIAN:SIGMA".
+    """
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Invalid latency spec: {spec}")
+
+
+def image_size_for(arguments: dict):
+    """Resolve output dimensions from fal-style arguments."""
+    size = arguments.get("image_size")
+    if isinstance(size, dict):
+        return int(size.get("width", 1024)), int(size.get("height", 1024))
+    return ASPECT_SIZES.get(arguments.get("aspect_ratio"), (1024, 1024))
+
+
+def render_image(rng: random.Random, prompt: str, size, garble_rate: float) -> bytes:
+    """Render a deterministic banner with the prompt's Hebrew word or pseudo-text."""
+    width, height = size
+    words = re.findall("[\u0590-\u05FF]+", prompt)
+    word = max(words, key=len) if words else ""
+    if not word or rng.random() < garble_rate:
+        length = len(word) or rng.randint(3, 6)
+        word = "".join(rng.choice(HEBREW_LETTERS) for _ in range(length))
+
+    background = tuple(rng.randint(160, 255) for _ in range(3))
+    foreground = tuple(rng.randint(0, 90) for _ in range(3))
+    img = Image.new("RGB", (width, height), background)
+    draw = ImageDraw.Draw(img)
+
+    font = None
+    for fp in FONT_PATHS:
+        try:
+            font = ImageFont.truetype(fp, max(12, height // 5))
+            break
+        except OSError:
+            continue
+    if font is None:
+        font = ImageFont.load_default()
+
+    text = reverse_hebrew(word)
+    bbox = draw.textbbox((0, 0), text, font=font)
+    x = (width - (bbox[2] - bbox[0])) // 2 - bbox[0]
+    y = (height - (bbox[3] - bbox[1])) // 2 - bbox[1]
+    draw.text((x, y), text, fill=foreground, font=font)
+
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class RateLimiter:
+    """Token bucket shared across all submit requests."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token; returns 0 on success, else seconds until one is free."""
+        if self.rate <= 0:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class FakeFalState:
+    """Job table, hosted files and simulation settings for the fake server."""
+
+    # Seconds a finished job (and its image) stays retrievable
+    JOB_TTL = 600
+    # Rendered PNGs kept in memory, least recently used evicted first
+    IMAGE_CACHE_SIZE = 64
+
+    def __init__(self, seed=0, latency="fixed:0.5", queue_delay="fixed:0",
+                 error_rate=0.0, garble_rate=0.5, rate_limit=0.0, burst=5):
+        self.seed = seed
+        self.latency = parse_latency(latency)
+        self.queue_delay = parse_latency(queue_delay)
+        self.error_rate = error_rate
+        self.garble_rate = garble_rate
+        self.limiter = RateLimiter(rate_limit, burst)
+        self.jobs = {}
+        self.queued = set()
+        self.images = {}
+        self.rendered = OrderedDict()
+        self.attempts = {}
+        self.lock = threading.Lock()
+
+    def submit(self, model_id: str, arguments: dict) -> str:
+        """Queue a job; its outcome is fixed up front from a seeded RNG."""
+        key = json.dumps([model_id, arguments], sort_keys=True, ensure_ascii=False)
+        now = time.monotonic()
+        with self.lock:
+            self.evict(now)
+            attempt = self.attempts.get(key, 0)
+            self.attempts[key] = attempt + 1
+            return self._create_job(key, attempt, model_id, arguments, now)
+
+    def _create_job(self, key: str, attempt: int, model_id: str, arguments: dict, now: float) -> str:
+        """Build and store one job. Caller holds the lock."""
+        digest = hashlib.sha256(f"{self.seed}|{key}|{attempt}".encode()).hexdigest()
+        rng = random.Random(digest)
+
+        started_at = now + self.queue_delay(rng)
+        job = {
+            "key": key,
+            "model_id": model_id,
+            "started_at": started_at,
+            "finished_at": started_at + self.latency(rng),
+            "failed": rng.random() < self.error_rate,
+            "cancelled": False,
+            "image_id": None,
+            "result": None,
+        }
+        if not job["failed"]:
+            # The image depends only on (seed, key), so retries share one file
+            image_id = hashlib.sha256(f"{self.seed}|{key}".encode()).hexdigest()[:32]
+            size = image_size_for(arguments)
+            job["image_id"] = image_id
+            job["result"] = {
+                "images": [{"url": f"/files/{image_id}.png", "width": size[0],
+                            "height": size[1], "content_type": "image/png"}],
+                "seed": int(digest[:8], 16),
+                "prompt": arguments.get("prompt", ""),
+            }
+
+        request_id = str(uuid.UUID(digest[:32]))
+        self.jobs[request_id] = job
+        if job["image_id"]:
+            self.images[job["image_id"]] = (arguments.get("prompt", ""), image_size_for(arguments))
+        if now < started_at:
+            self.queued.add(request_id)
+        return request_id
+
+    def evict(self, now: float):
+        """
+        Drop jobs finished more than JOB_TTL ago, plus the images and attempt
+        counters no remaining job references. Caller holds the lock.
+        """
+        expired = [rid for rid, job in self.jobs.items() if job["finished_at"] < now - self.JOB_TTL]
+        if not expired:
+            return
+        for rid in expired:
+            del self.jobs[rid]
+            self.queued.discard(rid)
+        live = {job["image_id"] for job in self.jobs.values()}
+        for image_id in [i for i in self.images if i not in live]:
+            del self.images[image_id]
+            self.rendered.pop(image_id, None)
+        live_keys = {job["key"] for job in self.jobs.values()}
+        for key in [k for k in self.attempts if k not in live_keys]:
+            del self.attempts[key]
+
+    def image(self, image_id: str):
+        """PNG bytes for a hosted image, rendered on first request."""
+        with self.lock:
+            if image_id in self.rendered:
+                self.rendered.move_to_end(image_id)
+                return self.rendered[image_id]
+            spec = self.images.get(image_id)
+        if spec is None:
+            return None
+
+        prompt, size = spec
+        rng = random.Random(hashlib.sha256(f"{self.seed}|{image_id}".encode()).hexdigest())
+        data = render_image(rng, prompt, size, self.garble_rate)
+        with self.lock:
+            self.rendered[image_id] = data
+            while len(self.rendered) > self.IMAGE_CACHE_SIZE:
+                self.rendered.popitem(last=False)
+        return data
+
+    def cancel(self, request_id: str):
+        """Cancel a job that has not completed; returns False if it already has."""
+        with self.lock:
+            job = self.jobs.get(request_id)
+            if job is None:
+                return None
+            now = time.monotonic()
+            if now >= job["finished_at"]:
+                return False
+            job["cancelled"] = True
+            job["started_at"] = job["finished_at"] = now
+            self.queued.discard(request_id)
+            return True
+
+    def status(self, request_id: str):
+        job = self.jobs.get(request_id)
+        if job is None:
+            return None
+        now = time.monotonic()
+        if now < job["started_at"]:
+            with self.lock:
+                self.queued = {rid for rid in self.queued if now < self.jobs[rid]["started_at"]}
+                position = sum(1 for rid in self.queued if self.jobs[rid]["started_at"] < job["started_at"])
+            return {"status": "IN_QUEUE", "queue_position": position}
+        if now < job["finished_at"]:
+            return {"status": "IN_PROGRESS", "logs": []}
+        return {"status": "COMPLETED", "logs": []}
+
+
+class FakeFalHandler(BaseHTTPRequestHandler):
+    """
+    Routes:
+        POST /{model_id}                         submit, returns request_id and URLs
+        GET  /{model_id}/requests/{id}/status    queue status
+        GET  /{model_id}/requests/{id}           result (500 if the job failed)
+        PUT  /{model_id}/requests/{id}/cancel    cancel a job that has not completed
+        GET  /files/{file_id}.png                hosted image
+    """
+
+    # Keep-alive, so clients can poll over one connection
+    protocol_version = "HTTP/1.1"
+    state: FakeFalState = None
+    quiet = False
+
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def send_json(self, code: int, payload: dict, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        # Always consume the body so a kept-alive connection stays in sync
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        model_id = urlparse(self.path).path.strip("/")
+        if not model_id:
+            return self.send_json(404, {"detail": "Missing model id"})
+        wait = self.state.limiter.acquire()
+        if wait:
+            return self.send_json(429, {"detail": "Rate limit exceeded"},
+                                  {"Retry-After": str(math.ceil(wait))})
+        try:
+            arguments = json.loads(body or b"{}")
+        except ValueError:
+            return self.send_json(422, {"detail": "Invalid JSON body"})
+
+        request_id = self.state.submit(model_id, arguments)
+        prefix = f"{self.base_url()}/{model_id}/requests/{request_id}"
+        self.send_json(200, {
+            "request_id": request_id,
+            "status_url": f"{prefix}/status",
+            "response_url": prefix,
+            "cancel_url": f"{prefix}/cancel",
+        })
+
+    def do_GET(self):
+        path = urlparse(self.path).path.strip("/")
+
+        if path.startswith("files/"):
+            data = self.state.image(path[len("files/"):].removesuffix(".png"))
+            if data is None:
+                return self.send_json(404, {"detail": "File not found"})
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        match = re.fullmatch(r"(.+)/requests/([0-9a-f-]+)(/status)?", path)
+        if not match:
+            return self.send_json(404, {"detail": "Not found"})
+        request_id, is_status = match.group(2), match.group(3)
+
+        status = self.state.status(request_id)
+        if status is None:
+            return self.send_json(404, {"detail": "Request not found"})
+        if is_status:
+            return self.send_json(200, status)
+        if status["status"] != "COMPLETED":
+            return self.send_json(400, {"detail": "Request is still in progress"})
+
+        job = self.state.jobs[request_id]
+        if job["cancelled"]:
+            return self.send_json(400, {"detail": "Request was cancelled"})
+        if job["failed"]:
+            return self.send_json(500, {"detail": "Simulated generation failure"})
+        result = json.loads(json.dumps(job["result"]))
+        for image in result["images"]:
+            image["url"] = self.base_url() + image["url"]
+        self.send_json(200, result)
+
+    def do_PUT(self):
+        path = urlparse(self.path).path.strip("/")
+        match = re.fullmatch(r"(.+)/requests/([0-9a-f-]+)/cancel", path)
+        if not match:
+            return self.send_json(404, {"detail": "Not found"})
+
+        cancelled = self.state.cancel(match.group(2))
+        if cancelled is None:
+            return self.send_json(404, {"detail": "Request not found"})
+        if not cancelled:
+            return self.send_json(400, {"status": "ALREADY_COMPLETED"})
+        self.send_json(202, {"status": "CANCELLATION_REQUESTED"})
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+class FakeFalServer(ThreadingHTTPServer):
+    """Threaded server sized for load tests; the stdlib backlog of 5 resets connections under load."""
+
+    request_queue_size = 512
+    daemon_threads = True
+
+
+def make_server(host: str, port: int, state: FakeFalState, quiet: bool = False):
+    """Build (but do not start) a threaded fake fal server bound to host:port."""
+    handler = type("Handler", (FakeFalHandler,), {"state": state, "quiet": quiet})
+    return FakeFalServer((host, port), handler)
+
+
+def check_concurrency(state: FakeFalState, clients: int) -> int:
+    """Run `clients` simultaneous jobs against an in-process server; returns the failure count."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from fal_queue import queue_subscribe
+
+    server = make_server("127.0.0.1", 0, state, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def job(i):
+        try:
+            queue_subscribe(base_url, "fal-ai/check", {"prompt": f"שלום {i}"})
+            return None
+        except Exception as e:
+            return e
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        errors = [e for e in pool.map(job, range(clients)) if e is not None]
+    server.shutdown()
+
+    print(f"{clients} clients: {clients - len(errors)} succeeded, {len(errors)} failed "
+          f"in {time.monotonic() - started:.1f}s")
+    for e in errors[:5]:
+        print(f"  {type(e).__name__}: {e}")
+    return len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake fal.ai queue server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latencies, failures and images")
+    parser.add_argument("--latency", default="fixed:0.5",
+                        help="Generation time: fixed:S, uniform:LO:HI, normal:MU:SIGMA, lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--queue-delay", default="fixed:0", help="Time spent IN_QUEUE, same format as --latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of jobs that fail")
+    parser.add_argument("--garble-rate", type=float, default=0.5,
+                        help="Fraction of images rendered with pseudo-Hebrew instead of the prompt word")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Submits per second (0 = unlimited)")
+    parser.add_argument("--burst", type=int, default=5, help="Rate limiter bucket size")
+    parser.add_argument("--quiet", action="store_true", help="Suppress request logging")
+    parser.add_argument("--check-concurrency", type=int, metavar="CLIENTS",
+                        help="Run this many simultaneous jobs in-process and exit non-zero on any failure")
+    args = parser.parse_args()
+
+    state = FakeFalState(
+        seed=args.seed,
+        latency=args.latency,
+        queue_delay=args.queue_delay,
+        error_rate=args.error_rate,
+        garble_rate=args.garble_rate,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+    )
+    if args.check_concurrency:
+        raise SystemExit(1 if check_concurrency(state, args.check_concurrency) else 0)
+
+    server = make_server(args.host, args.port, state, quiet=args.quiet)
+    print(f"Fake fal.ai server on http://{args.host}:{args.port}")
+    print(f"Set FAL_QUEUE_URL=http://{args.host}:{args.port} to use it")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
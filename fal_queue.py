@@ -0,0 +1,59 @@
+"""
+Minimal client for a fal-compatible queue API over plain HTTP.
+
+Used by the run scripts when FAL_QUEUE_URL is set, e.g. to target
+fake_fal_server.py for offline runs.
+"""
+
+import time
+
+import requests
+
+# Per-request HTTP timeout (seconds)
+REQUEST_TIMEOUT = 30
+# Overall limit for submit + polling + result (seconds)
+JOB_TIMEOUT = 600
+# Submit attempts when the queue answers 429 Too Many Requests
+MAX_RATE_LIMIT_RETRIES = 8
+
+
+def retry_delay(response: requests.Response, attempt: int) -> float:
+    """Seconds to wait before retrying a 429, honouring Retry-After."""
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return min(30.0, 0.5 * 2 ** attempt)
+
+
+def queue_subscribe(base_url: str, model_id: str, arguments: dict,
+                    poll_interval: float = 0.1, timeout: float = JOB_TIMEOUT):
+    """Submit a job to the queue at base_url and wait for its result."""
+    deadline = time.monotonic() + timeout
+
+    def remaining() -> float:
+        left = deadline - time.monotonic()
+        if left <= 0:
+            raise TimeoutError(f"{model_id} did not complete within {timeout:.0f}s")
+        return left
+
+    # One session per job, so polls reuse a kept-alive connection
+    with requests.Session() as session:
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            response = session.post(f"{base_url.rstrip('/')}/{model_id}", json=arguments,
+                                     timeout=min(REQUEST_TIMEOUT, remaining()))
+            if response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                break
+            time.sleep(min(retry_delay(response, attempt), remaining()))
+        response.raise_for_status()
+        handle = response.json()
+
+        while True:
+            status = session.get(handle["status_url"], timeout=min(REQUEST_TIMEOUT, remaining()))
+            status.raise_for_status()
+            if status.json()["status"] == "COMPLETED":
+                break
+            time.sleep(min(poll_interval, remaining()))
+
+        result = session.get(handle["response_url"], timeout=min(REQUEST_TIMEOUT, remaining()))
+        result.raise_for_status()
+        return result.json()
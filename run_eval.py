@@ -2,13 +2,28 @@
 """Hebrew text rendering evaluation across image generation models."""
 
 import os
+import time
 import fal_client
 from PIL import Image, ImageDraw, ImageFont
 import requests
 from io import BytesIO
 from pathlib import Path
 
+from fal_queue import queue_subscribe
+from sweep_events import emit
+
 # API key should be set via environment variable FAL_KEY
+# Set FAL_QUEUE_URL (e.g. http://127.0.0.1:8765 for fake_fal_server.py) to use a fal-compatible queue directly
+FAL_QUEUE_URL = os.environ.get("FAL_QUEUE_URL")
+
+# Committed results by default; with EVAL_OUTPUT_DIR set, this series writes to
+# EVAL_OUTPUT_DIR/series1 (required with FAL_QUEUE_URL)
+EVAL_OUTPUT_DIR = os.environ.get("EVAL_OUTPUT_DIR")
+OUTPUT_BASE = Path(EVAL_OUTPUT_DIR) / "series1" if EVAL_OUTPUT_DIR else Path("outputs")
+
+# Committed output directories of every series; never written to from a fake queue
+REPO_DIR = Path(__file__).resolve().parent
+COMMITTED_OUTPUTS = [REPO_DIR / "outputs", REPO_DIR / "outputs-series2"]
 
 MODELS = [
     ("fal-ai/flux-2", "Flux 2"),
@@ -62,9 +77,15 @@ def annotate_image(img_path: Path, model_name: str, output_path: Path):
     new_img.save(output_path)
     print(f"  Annotated: {output_path}")
 
+def subscribe(model_id: str, arguments: dict):
+    """Run a fal job, via the queue at FAL_QUEUE_URL when it is set."""
+    if FAL_QUEUE_URL:
+        return queue_subscribe(FAL_QUEUE_URL, model_id, arguments)
+    return fal_client.subscribe(model_id, arguments=arguments)
+
 def generate_image(model_id: str, model_name: str, prompt: str, word_name: str):
     """Generate image using fal.ai API."""
-    output_dir = Path(f"outputs/{word_name}")
+    output_dir = OUTPUT_BASE / word_name
     output_dir.mkdir(parents=True, exist_ok=True)
 
     safe_name = model_name.lower().replace(" ", "-").replace(".", "-")
@@ -73,14 +94,18 @@ def generate_image(model_id: str, model_name: str, prompt: str, word_name: str):
 
     if final_path.exists():
         print(f"  Skipping {model_name} - already exists")
+        emit("job_skipped", model=model_name, word=word_name)
         return True
 
     print(f"  Generating with {model_name}...")
 
+    emit("job_started", model=model_name, word=word_name)
+    started = time.monotonic()
+
     try:
         # Different models have different parameter names
         if "imagen" in model_id.lower() or "gemini" in model_id.lower():
-            result = fal_client.subscribe(
+            result = subscribe(
                 model_id,
                 arguments={
                     "prompt": prompt,
@@ -88,7 +113,7 @@ def generate_image(model_id: str, model_name: str, prompt: str, word_name: str):
                 },
             )
         elif "ideogram" in model_id.lower():
-            result = fal_client.subscribe(
+            result = subscribe(
                 model_id,
                 arguments={
                     "prompt": prompt,
@@ -96,7 +121,7 @@ def generate_image(model_id: str, model_name: str, prompt: str, word_name: str):
                 },
             )
         elif "recraft" in model_id.lower():
-            result = fal_client.subscribe(
+            result = subscribe(
                 model_id,
                 arguments={
                     "prompt": prompt,
@@ -104,7 +129,7 @@ def generate_image(model_id: str, model_name: str, prompt: str, word_name: str):
                 },
             )
         else:
-            result = fal_client.subscribe(
+            result = subscribe(
                 model_id,
                 arguments={
                     "prompt": prompt,
@@ -122,6 +147,8 @@ def generate_image(model_id: str, model_name: str, prompt: str, word_name: str):
                 img_url = result["output"]
             else:
                 print(f"  Unexpected result format: {result.keys()}")
+                emit("job_failed", model=model_name, word=word_name,
+                     duration=time.monotonic() - started, error="Unexpected result format")
                 return False
         else:
             img_url = str(result)
@@ -136,28 +163,52 @@ def generate_image(model_id: str, model_name: str, prompt: str, word_name: str):
 
         # Remove raw file
         raw_path.unlink()
+        emit("job_finished", model=model_name, word=word_name, duration=time.monotonic() - started)
 
         return True
 
     except Exception as e:
         print(f"  ERROR with {model_name}: {e}")
+        emit("job_failed", model=model_name, word=word_name,
+             duration=time.monotonic() - started, error=str(e))
         return False
+    except BaseException as e:
+        # Ctrl-C or exit mid-job: close the job out in the event stream, then stop
+        emit("job_failed", model=model_name, word=word_name,
+             duration=time.monotonic() - started, error=f"interrupted ({type(e).__name__})")
+        raise
 
 def main():
+    if FAL_QUEUE_URL:
+        base = OUTPUT_BASE.resolve()
+        if not EVAL_OUTPUT_DIR or any(base == d or d in base.parents for d in COMMITTED_OUTPUTS):
+            raise SystemExit("FAL_QUEUE_URL is set: set EVAL_OUTPUT_DIR outside outputs/ and outputs-series2/ "
+                             "so results don't mix into the committed ones")
+
     print("Hebrew Image Generation Evaluation")
     print("=" * 50)
 
     results = {}
 
-    for word_name, hebrew_word, prompt in WORDS:
-        print(f"\nGenerating images for: {hebrew_word} ({word_name})")
-        print("-" * 40)
-
-        results[word_name] = {}
-
+    emit("sweep_started", sweep="series1", total=len(WORDS) * len(MODELS))
+    for word_name, _, _ in WORDS:
         for model_id, model_name in MODELS:
-            success = generate_image(model_id, model_name, prompt, word_name)
-            results[word_name][model_name] = success
+            emit("job_queued", model=model_name, word=word_name)
+
+    status = "aborted"
+    try:
+        for word_name, hebrew_word, prompt in WORDS:
+            print(f"\nGenerating images for: {hebrew_word} ({word_name})")
+            print("-" * 40)
+
+            results[word_name] = {}
+
+            for model_id, model_name in MODELS:
+                success = generate_image(model_id, model_name, prompt, word_name)
+                results[word_name][model_name] = success
+        status = "completed"
+    finally:
+        emit("sweep_finished", sweep="series1", status=status)
 
     # Print summary
     print("\n" + "=" * 50)
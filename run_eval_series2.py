@@ -5,12 +5,16 @@ Testing if models respond better when the entire prompt is in Hebrew.
 """
 
 import os
+import time
 import fal_client
 from PIL import Image, ImageDraw, ImageFont
 import requests
 from io import BytesIO
 from pathlib import Path
 
+from fal_queue import queue_subscribe
+from sweep_events import emit
+
 # Subset of models to test in Series 2
 MODELS = [
     ("fal-ai/nano-banana-pro", "Nano Banana Pro"),
@@ -25,7 +29,17 @@ WORDS = [
     ("firgun", "פירגון", "גרפיקה עם המילה פירגון בגופן גדול"),
 ]
 
-OUTPUT_BASE = Path("outputs-series2")
+# Committed results by default; with EVAL_OUTPUT_DIR set, this series writes to
+# EVAL_OUTPUT_DIR/series2 (required with FAL_QUEUE_URL)
+EVAL_OUTPUT_DIR = os.environ.get("EVAL_OUTPUT_DIR")
+OUTPUT_BASE = Path(EVAL_OUTPUT_DIR) / "series2" if EVAL_OUTPUT_DIR else Path("outputs-series2")
+
+# Committed output directories of every series; never written to from a fake queue
+REPO_DIR = Path(__file__).resolve().parent
+COMMITTED_OUTPUTS = [REPO_DIR / "outputs", REPO_DIR / "outputs-series2"]
+
+# Set FAL_QUEUE_URL (e.g. http://127.0.0.1:8765 for fake_fal_server.py) to use a fal-compatible queue directly
+FAL_QUEUE_URL = os.environ.get("FAL_QUEUE_URL")
 
 
 def annotate_image(img_path: Path, model_name: str, output_path: Path):
@@ -52,6 +66,13 @@ def annotate_image(img_path: Path, model_name: str, output_path: Path):
     print(f"  Annotated: {output_path}")
 
 
+def subscribe(model_id: str, arguments: dict):
+    """Run a fal job, via the queue at FAL_QUEUE_URL when it is set."""
+    if FAL_QUEUE_URL:
+        return queue_subscribe(FAL_QUEUE_URL, model_id, arguments)
+    return fal_client.subscribe(model_id, arguments=arguments)
+
+
 def generate_image(model_id: str, model_name: str, prompt: str, word_name: str):
     """Generate image using fal.ai API."""
     output_dir = OUTPUT_BASE / word_name
@@ -63,13 +84,17 @@ def generate_image(model_id: str, model_name: str, prompt: str, word_name: str):
 
     if final_path.exists():
         print(f"  Skipping {model_name} - already exists")
+        emit("job_skipped", model=model_name, word=word_name)
         return True
 
     print(f"  Generating with {model_name}...")
     print(f"  Prompt: {prompt}")
 
+    emit("job_started", model=model_name, word=word_name)
+    started = time.monotonic()
+
     try:
-        result = fal_client.subscribe(
+        result = subscribe(
             model_id,
             arguments={
                 "prompt": prompt,
@@ -87,6 +112,8 @@ def generate_image(model_id: str, model_name: str, prompt: str, word_name: str):
                 img_url = result["output"]
             else:
                 print(f"  Unexpected result format: {result.keys()}")
+                emit("job_failed", model=model_name, word=word_name,
+                     duration=time.monotonic() - started, error="Unexpected result format")
                 return False
         else:
             img_url = str(result)
@@ -97,15 +124,29 @@ def generate_image(model_id: str, model_name: str, prompt: str, word_name: str):
 
         annotate_image(raw_path, model_name, final_path)
         raw_path.unlink()
+        emit("job_finished", model=model_name, word=word_name, duration=time.monotonic() - started)
 
         return True
 
     except Exception as e:
         print(f"  ERROR with {model_name}: {e}")
+        emit("job_failed", model=model_name, word=word_name,
+             duration=time.monotonic() - started, error=str(e))
         return False
+    except BaseException as e:
+        # Ctrl-C or exit mid-job: close the job out in the event stream, then stop
+        emit("job_failed", model=model_name, word=word_name,
+             duration=time.monotonic() - started, error=f"interrupted ({type(e).__name__})")
+        raise
 
 
 def main():
+    if FAL_QUEUE_URL:
+        base = OUTPUT_BASE.resolve()
+        if not EVAL_OUTPUT_DIR or any(base == d or d in base.parents for d in COMMITTED_OUTPUTS):
+            raise SystemExit("FAL_QUEUE_URL is set: set EVAL_OUTPUT_DIR outside outputs/ and outputs-series2/ "
+                             "so results don't mix into the committed ones")
+
     print("=" * 60)
     print("Series 2: Hebrew Prompts Evaluation")
     print("Testing with prompts written entirely in Hebrew")
@@ -113,16 +154,26 @@ def main():
 
     results = {}
 
-    for word_name, hebrew_word, prompt in WORDS:
-        print(f"\nGenerating images for: {hebrew_word} ({word_name})")
-        print(f"Hebrew prompt: {prompt}")
-        print("-" * 50)
-
-        results[word_name] = {}
-
+    emit("sweep_started", sweep="series2", total=len(WORDS) * len(MODELS))
+    for word_name, _, _ in WORDS:
         for model_id, model_name in MODELS:
-            success = generate_image(model_id, model_name, prompt, word_name)
-            results[word_name][model_name] = success
+            emit("job_queued", model=model_name, word=word_name)
+
+    status = "aborted"
+    try:
+        for word_name, hebrew_word, prompt in WORDS:
+            print(f"\nGenerating images for: {hebrew_word} ({word_name})")
+            print(f"Hebrew prompt: {prompt}")
+            print("-" * 50)
+
+            results[word_name] = {}
+
+            for model_id, model_name in MODELS:
+                success = generate_image(model_id, model_name, prompt, word_name)
+                results[word_name][model_name] = success
+        status = "completed"
+    finally:
+        emit("sweep_finished", sweep="series2", status=status)
 
     print("\n" + "=" * 60)
     print("SERIES 2 SUMMARY")
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Live dashboard for evaluation sweeps.
+
+Tails the event file written by the run scripts (see sweep_events.py) and
+shows throughput, ETA, per-model in-flight counts, latency and error rates
+in the terminal, optionally also as a self-refreshing HTML page.
+
+    SWEEP_EVENTS=events.jsonl python run_eval.py
+    python sweep_dashboard.py events.jsonl --html dashboard.html
+"""
+
+import argparse
+import html
+import json
+import statistics
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+
+# Completions in this window (seconds) drive throughput and ETA
+THROUGHPUT_WINDOW = 300
+# A model is flagged SLOW when its mean successful job time exceeds this
+# multiple of the other models' median
+SLOW_FACTOR = 2.0
+# ...and ERRORS when its error rate is this far above the other models' median
+ERROR_MARGIN = 0.3
+MIN_FAILURES_FLAGGED = 2
+
+
+class SweepState:
+    """Aggregates events into sweep and per-model counters."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, sweep=None, total=0, ts=None):
+        self.sweep = sweep
+        self.total = total
+        self.started_at = ts
+        self.finished_at = None
+        self.status = "running"
+        self.queued = 0
+        self.skipped = 0
+        self.completions = deque()
+        self.models = defaultdict(lambda: {
+            "in_flight": 0, "finished": 0, "failed": 0, "durations": [], "last_error": None,
+        })
+
+    def apply(self, e: dict):
+        event, model = e["event"], e.get("model")
+        if event == "sweep_started":
+            self.reset(e.get("sweep"), e.get("total", 0), e["ts"])
+        elif event == "sweep_finished":
+            self.finished_at = e["ts"]
+            self.status = e.get("status", "completed")
+        elif event == "job_queued":
+            self.queued += 1
+        elif event == "job_skipped":
+            self.skipped += 1
+        elif event == "job_started":
+            self.models[model]["in_flight"] += 1
+        elif event in ("job_finished", "job_failed"):
+            stats = self.models[model]
+            stats["in_flight"] = max(0, stats["in_flight"] - 1)
+            if event == "job_failed":
+                stats["failed"] += 1
+                stats["last_error"] = e.get("error")
+            else:
+                # Failures (e.g. an instant 429) would drag a throttled endpoint's mean down
+                stats["finished"] += 1
+                stats["durations"].append(e.get("duration", 0.0))
+            self.completions.append(e["ts"])
+
+    def summary(self, now: float) -> dict:
+        now = self.finished_at or now
+        while self.completions and self.completions[0] < now - THROUGHPUT_WINDOW:
+            self.completions.popleft()
+        done = sum(s["finished"] + s["failed"] for s in self.models.values()) + self.skipped
+        total = self.total or self.queued
+        elapsed = now - (self.started_at or now)
+        window = min(THROUGHPUT_WINDOW, elapsed) if elapsed > 0 else 0
+        per_min = len(self.completions) / window * 60 if window else 0.0
+        remaining = max(0, total - done)
+        eta = remaining / per_min * 60 if per_min and not self.finished_at else None
+
+        rows = []
+        for model, s in sorted(self.models.items()):
+            attempts = s["finished"] + s["failed"]
+            rows.append({
+                "model": model,
+                "in_flight": s["in_flight"],
+                "finished": s["finished"],
+                "failed": s["failed"],
+                "error_rate": s["failed"] / attempts if attempts else 0.0,
+                "mean_duration": statistics.fmean(s["durations"]) if s["durations"] else None,
+                "last_error": s["last_error"],
+            })
+
+        # Flag endpoints that stand out from the others, e.g. throttled ones
+        for r in rows:
+            others = [o for o in rows if o is not r]
+            r["flags"] = []
+            other_means = [o["mean_duration"] for o in others if o["mean_duration"] is not None]
+            if r["mean_duration"] is not None and other_means:
+                if r["mean_duration"] > SLOW_FACTOR * statistics.median(other_means):
+                    r["flags"].append("SLOW")
+            baseline_errors = statistics.median([o["error_rate"] for o in others]) if others else 0.0
+            if r["failed"] >= MIN_FAILURES_FLAGGED and r["error_rate"] >= baseline_errors + ERROR_MARGIN:
+                r["flags"].append("ERRORS")
+
+        return {
+            "sweep": self.sweep or "-",
+            "done": done,
+            "total": total,
+            "failed": sum(r["failed"] for r in rows),
+            "elapsed": elapsed,
+            "per_min": per_min,
+            "eta": eta,
+            "finished": self.finished_at is not None,
+            "status": self.status,
+            "rows": rows,
+        }
+
+
+def tail(path: Path, offset: int):
+    """Read complete new lines from path starting at offset."""
+    if not path.exists():
+        return [], offset
+    with open(path, "rb") as f:
+        if path.stat().st_size < offset:
+            offset = 0  # file was truncated or replaced
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    events = []
+    for line in data[:end].splitlines():
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            continue
+    return events, offset + end
+
+
+def fmt_duration(seconds) -> str:
+    if seconds is None:
+        return "-"
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def render_text(s: dict) -> str:
+    lines = [
+        f"Sweep: {s['sweep']} ({s['status']})",
+        "=" * 72,
+        f"Progress: {s['done']}/{s['total']}   Failed: {s['failed']}   "
+        f"Elapsed: {fmt_duration(s['elapsed'])}   "
+        f"Throughput: {s['per_min']:.1f}/min   ETA: {fmt_duration(s['eta'])}",
+        "-" * 72,
+        f"{'Model':<20} {'In flight':>9} {'Done':>6} {'Failed':>7} {'Err %':>6} {'Mean s':>8}",
+    ]
+    for r in s["rows"]:
+        mean = f"{r['mean_duration']:.1f}" if r["mean_duration"] is not None else "-"
+        flag = "".join(f"  {f}" for f in r["flags"])
+        lines.append(
+            f"{r['model']:<20} {r['in_flight']:>9} {r['finished']:>6} {r['failed']:>7} "
+            f"{r['error_rate']:>6.0%} {mean:>8}{flag}"
+        )
+        if r["last_error"]:
+            lines.append(f"  last error: {r['last_error'][:66]}")
+    return "\n".join(lines)
+
+
+def render_html(s: dict, refresh: float) -> str:
+    rows = []
+    for r in s["rows"]:
+        mean = f"{r['mean_duration']:.1f}" if r["mean_duration"] is not None else "-"
+        style = ' style="background:#fdd"' if r["flags"] else ""
+        rows.append(
+            f"<tr{style}><td>{html.escape(r['model'])}</td><td>{r['in_flight']}</td>"
+            f"<td>{r['finished']}</td><td>{r['failed']}</td><td>{r['error_rate']:.0%}</td>"
+            f"<td>{mean}</td><td>{html.escape(r['last_error'] or '')}</td></tr>"
+        )
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><meta http-equiv="refresh" content="{max(1, int(refresh))}">
+<title>Sweep: {html.escape(s['sweep'])}</title>
+<style>body{{font-family:sans-serif}} td,th{{padding:4px 10px;text-align:right}} td:first-child,td:last-child{{text-align:left}}</style>
+</head><body>
+<h2>Sweep: {html.escape(s['sweep'])} ({s['status']})</h2>
+<p>Progress: {s['done']}/{s['total']} &middot; Failed: {s['failed']} &middot;
+Elapsed: {fmt_duration(s['elapsed'])} &middot; Throughput: {s['per_min']:.1f}/min &middot;
+ETA: {fmt_duration(s['eta'])}</p>
+<table><tr><th>Model</th><th>In flight</th><th>Done</th><th>Failed</th><th>Err %</th><th>Mean s</th><th>Last error</th></tr>
+{"".join(rows)}
+</table></body></html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live dashboard for evaluation sweeps")
+    parser.add_argument("events", type=Path, help="Event file written via SWEEP_EVENTS")
+    parser.add_argument("--interval", type=float, default=2.0, help="Refresh interval in seconds")
+    parser.add_argument("--html", type=Path, help="Also write a self-refreshing HTML dashboard here")
+    parser.add_argument("--once", action="store_true", help="Render once and exit")
+    args = parser.parse_args()
+
+    state = SweepState()
+    offset = 0
+    try:
+        while True:
+            events, offset = tail(args.events, offset)
+            for e in events:
+                state.apply(e)
+            summary = state.summary(time.time())
+
+            if args.once:
+                print(render_text(summary))
+            else:
+                print("\033[2J\033[H" + render_text(summary), flush=True)
+            if args.html:
+                args.html.write_text(render_html(summary, args.interval), encoding="utf-8")
+
+            if args.once:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Structured event stream for evaluation sweeps.
+
+Set SWEEP_EVENTS to a file path and the run scripts append one JSON object
+per line for each job transition (queued, started, finished, failed,
+skipped). Follow it live with sweep_dashboard.py.
+"""
+
+import json
+import os
+import threading
+import time
+
+EVENTS_PATH = os.environ.get("SWEEP_EVENTS")
+
+_lock = threading.Lock()
+
+
+def emit(event: str, **fields):
+    """Append an event to SWEEP_EVENTS; does nothing when it is unset."""
+    if not EVENTS_PATH:
+        return
+    record = {"ts": time.time(), "event": event, **fields}
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _lock, open(EVENTS_PATH, "a", encoding="utf-8") as f:
+        f.write(line)